@@ -252,16 +252,19 @@ class DirichletPartitioner(Partitioner):
                     for nid, prop in nid_to_proportion_of_k_samples.copy().items():
                         nid_to_proportion_of_k_samples[nid] = prop / sum_proportions
 
-                # Determine the split indices
-                cumsum_division_fractions = np.cumsum(
+                # Determine the split indices (the scaling is done in place to avoid
+                # allocating temporary arrays)
+                cumsum_division_numbers = np.cumsum(
                     list(nid_to_proportion_of_k_samples.values())
                 )
-                cumsum_division_numbers = cumsum_division_fractions * len(
-                    indices_representing_class_k
+                np.multiply(
+                    cumsum_division_numbers,
+                    len(indices_representing_class_k),
+                    out=cumsum_division_numbers,
                 )
                 # [:-1] is because the np.split requires the division indices but the
                 # last element represents the sum = total number of samples
-                indices_on_which_split = cumsum_division_numbers.astype(int)[:-1]
+                indices_on_which_split = cumsum_division_numbers[:-1].astype(int)
 
                 split_indices = np.split(
                     indices_representing_class_k, indices_on_which_split
@@ -16,12 +16,12 @@
 
 
 import warnings
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 import numpy as np
 
 import datasets
-from flwr_datasets.common.typing import NDArray
+from flwr_datasets.common.typing import NDArrayInt
 from flwr_datasets.partitioner.partitioner import Partitioner
 
 
@@ -114,13 +114,16 @@ class PathologicalPartitioner(Partitioner):
         self._rng = np.random.default_rng(seed=self._seed)
 
         # Utility attributes
-        self._partition_id_to_indices: Dict[int, List[int]] = {}
+        self._partition_id_to_indices: Dict[int, NDArrayInt] = {}
         self._partition_id_to_unique_labels: Dict[int, List[Any]] = {
             pid: [] for pid in range(self._num_partitions)
         }
         self._unique_labels: List[Any] = []
-        # Count in how many partitions the label is used
-        self._unique_label_to_times_used_counter: Dict[Any, int] = {}
+        # Count in how many partitions the label is used (indexed by the position of
+        # the label in the sorted _unique_labels)
+        self._unique_label_to_times_used_counter: NDArrayInt = np.zeros(
+            0, dtype=np.int64
+        )
         self._partition_id_to_indices_determined = False
 
     def load_partition(self, partition_id: int) -> datasets.Dataset:
@@ -139,51 +142,85 @@ class PathologicalPartitioner(Partitioner):
         # The partitioning is done lazily - only when the first partition is
         # requested. Only the first call creates the indices assignments for all the
         # partition indices.
-        self._check_num_partitions_correctness_if_needed()
-        self._determine_partition_id_to_indices_if_needed()
+        if not self._partition_id_to_indices_determined:
+            self._first_time_setup()
         return self.dataset.select(self._partition_id_to_indices[partition_id])
 
     @property
     def num_partitions(self) -> int:
         """Total number of partitions."""
+        if not self._partition_id_to_indices_determined:
+            self._first_time_setup()
+        return self._num_partitions
+
+    def _first_time_setup(self) -> None:
+        """Run the checks and create the partitioning (done only once)."""
         self._check_num_partitions_correctness_if_needed()
         self._determine_partition_id_to_indices_if_needed()
-        return self._num_partitions
 
     def _determine_partition_id_to_indices_if_needed(self) -> None:
         """Create an assignment of indices to the partition indices."""
         if self._partition_id_to_indices_determined:
             return
+        # Read the column directly as a NumPy array (without creating Python objects)
+        labels = self.dataset.with_format("numpy", columns=[self._partition_by])[
+            self._partition_by
+        ]
+        # Group the indices by label with a single sort instead of scanning the
+        # labels once per unique label
+        unique_labels_sorted, label_ids, label_counts = np.unique(
+            labels, return_inverse=True, return_counts=True
+        )
+        # The sorted unique labels are reused to avoid another scan of the column
+        self._unique_labels = unique_labels_sorted.tolist()
         self._determine_partition_id_to_unique_labels()
-        assert self._unique_labels is not None
-        self._count_partitions_having_each_unique_label()
-
-        labels = np.asarray(self.dataset[self._partition_by])
-        self._check_correctness_of_unique_label_to_times_used_counter(labels)
+        # Position of each (sorted) label assigned to each partition, shape
+        # (num_partitions, num_classes_per_partition)
+        partition_label_ids = np.sort(
+            np.searchsorted(
+                unique_labels_sorted,
+                [
+                    self._partition_id_to_unique_labels[partition_id]
+                    for partition_id in range(self._num_partitions)
+                ],
+            ),
+            axis=1,
+        )
+        self._count_partitions_having_each_unique_label(partition_label_ids)
+        self._check_correctness_of_unique_label_to_times_used_counter(label_counts)
+
+        # Sorting the integer label ids is cheaper than sorting the raw labels (that
+        # can be e.g. strings)
+        indices_sorted_by_label = np.argsort(label_ids, kind="stable")
+        if len(labels) <= np.iinfo(np.int32).max:
+            # Halve the memory of the index arrays (all the partitions' indices are
+            # gathered from this array)
+            indices_sorted_by_label = indices_sorted_by_label.astype(
+                np.int32, copy=False
+            )
+        slot_starts, slot_sizes = self._determine_slot_bounds(
+            partition_label_ids, label_counts
+        )
+        # Gather the indices of all the partitions into a single flat array, the
+        # partition boundaries are given by the offsets
+        slot_offsets = np.cumsum(slot_sizes) - slot_sizes
+        all_indices = indices_sorted_by_label[
+            np.repeat(slot_starts - slot_offsets, slot_sizes)
+            + np.arange(slot_sizes.sum())
+        ]
+        partition_sizes = slot_sizes.reshape(partition_label_ids.shape).sum(axis=1)
+        partition_offsets = np.concatenate(([0], np.cumsum(partition_sizes)))
         for partition_id in range(self._num_partitions):
-            self._partition_id_to_indices[partition_id] = []
-
-        unused_labels = []
-        for unique_label in self._unique_labels:
-            if self._unique_label_to_times_used_counter[unique_label] == 0:
-                unused_labels.append(unique_label)
-                continue
-            # Get the indices in the original dataset where the y == unique_label
-            unique_label_to_indices = np.where(labels == unique_label)[0]
-
-            split_unique_labels_to_indices = np.array_split(
-                unique_label_to_indices,
-                self._unique_label_to_times_used_counter[unique_label],
+            self._partition_id_to_indices[partition_id] = all_indices[
+                partition_offsets[partition_id] : partition_offsets[partition_id + 1]
+            ]
+
+        unused_labels = [
+            self._unique_labels[label_id]
+            for label_id in np.flatnonzero(
+                self._unique_label_to_times_used_counter == 0
             )
-
-            split_index = 0
-            for partition_id in range(self._num_partitions):
-                if unique_label in self._partition_id_to_unique_labels[partition_id]:
-                    self._partition_id_to_indices[partition_id].extend(
-                        split_unique_labels_to_indices[split_index]
-                    )
-                    split_index += 1
-
+        ]
         if len(unused_labels) >= 1:
             warnings.warn(
                 f"Classes: {unused_labels} will NOT be used due to the chosen "
@@ -194,12 +231,58 @@ class PathologicalPartitioner(Partitioner):
                 stacklevel=1,
             )
         if self._shuffle:
-            for indices in self._partition_id_to_indices.values():
-                # In place shuffling
-                self._rng.shuffle(indices)
+            self._shuffle_partitions(all_indices, partition_sizes)
 
         self._partition_id_to_indices_determined = True
 
+    def _shuffle_partitions(
+        self, all_indices: NDArrayInt, partition_sizes: NDArrayInt
+    ) -> None:
+        """Shuffle the indices within each partition.
+
+        The shuffling is done in place (the partitions are views of `all_indices`).
+        """
+        if np.all(partition_sizes == partition_sizes[0]):
+            # Shuffle all the equally sized partitions in a single call
+            all_indices_matrix = all_indices.reshape(self._num_partitions, -1)
+            self._rng.permuted(all_indices_matrix, axis=1, out=all_indices_matrix)
+        else:
+            permuted = self._rng.permuted
+            for indices in self._partition_id_to_indices.values():
+                permuted(indices, out=indices)
+
+    def _determine_slot_bounds(
+        self, partition_label_ids: NDArrayInt, label_counts: NDArrayInt
+    ) -> Tuple[NDArrayInt, NDArrayInt]:
+        """Determine the samples of each label assigned to each partition.
+
+        Returns the start (in the indices sorted by label) and the number of samples for
+        each (partition, label) pair, flattened in the partition_id order.
+        """
+        times_used = self._unique_label_to_times_used_counter
+        label_offsets = np.cumsum(label_counts) - label_counts
+        # The k-th partition (in the partition_id order) that uses a label gets the
+        # k-th split of the samples of this label
+        flat_label_ids = partition_label_ids.ravel()
+        slot_order = np.argsort(flat_label_ids, kind="stable")
+        flat_split_index = np.empty_like(flat_label_ids)
+        flat_split_index[slot_order] = np.arange(flat_label_ids.size) - np.repeat(
+            np.cumsum(times_used) - times_used, times_used
+        )
+
+        # The samples of each label are divided as by np.array_split: the first
+        # (num_samples % times_used) splits have one more sample than the rest
+        split_size, num_larger_splits = np.divmod(
+            label_counts[flat_label_ids], times_used[flat_label_ids]
+        )
+        slot_starts = (
+            label_offsets[flat_label_ids]
+            + flat_split_index * split_size
+            + np.minimum(flat_split_index, num_larger_splits)
+        )
+        slot_sizes = split_size + (flat_split_index < num_larger_splits)
+        return slot_starts, slot_sizes
+
     def _check_num_partitions_correctness_if_needed(self) -> None:
         """Test num_partitions when the dataset is given (in load_partition)."""
         if not self._partition_id_to_indices_determined:
@@ -210,8 +293,10 @@ class PathologicalPartitioner(Partitioner):
                 )
 
     def _determine_partition_id_to_unique_labels(self) -> None:
-        """Determine the assignment of unique labels to the partitions."""
-        self._unique_labels = sorted(self.dataset.unique(self._partition_by))
+        """Determine the assignment of unique labels to the partitions.
+
+        It requires the sorted `_unique_labels` to be already determined.
+        """
         num_unique_classes = len(self._unique_labels)
 
         if self._num_classes_per_partition > num_unique_classes:
@@ -225,7 +310,7 @@ class PathologicalPartitioner(Partitioner):
         if self._class_assignment_mode == "first-deterministic":
             # if self._first_class_deterministic_assignment:
             for partition_id in range(self._num_partitions):
-                label = partition_id % num_unique_classes
+                label = self._unique_labels[partition_id % num_unique_classes]
                 self._partition_id_to_unique_labels[partition_id].append(label)
 
                 while (
@@ -236,14 +321,15 @@ class PathologicalPartitioner(Partitioner):
                     if label not in self._partition_id_to_unique_labels[partition_id]:
                         self._partition_id_to_unique_labels[partition_id].append(label)
         elif self._class_assignment_mode == "deterministic":
-            for partition_id in range(self._num_partitions):
-                labels = []
-                for i in range(self._num_classes_per_partition):
-                    label = self._unique_labels[
-                        (partition_id + i) % len(self._unique_labels)
-                    ]
-                    labels.append(label)
-                self._partition_id_to_unique_labels[partition_id] = labels
+            # Partition partition_id has labels (partition_id + i) % num_unique_classes
+            partition_label_ids = (
+                np.arange(self._num_partitions)[:, None]
+                + np.arange(self._num_classes_per_partition)[None, :]
+            ) % num_unique_classes
+            for partition_id, label_ids in enumerate(partition_label_ids.tolist()):
+                self._partition_id_to_unique_labels[partition_id] = [
+                    self._unique_labels[label_id] for label_id in label_ids
+                ]
         elif self._class_assignment_mode == "random":
             for partition_id in range(self._num_partitions):
                 labels = self._rng.choice(
@@ -258,43 +344,41 @@ class PathologicalPartitioner(Partitioner):
                 f"'first-deterministic'. You provided: {self._class_assignment_mode}."
             )
 
-    def _count_partitions_having_each_unique_label(self) -> None:
+    def _count_partitions_having_each_unique_label(
+        self, partition_label_ids: NDArrayInt
+    ) -> None:
         """Count the number of partitions that have each unique label.
 
         This computation is based on the assigment of the label to the partition_id in
-        the `_determine_partition_id_to_unique_labels` method.
+        the `_determine_partition_id_to_unique_labels` method (given as positions of
+        the labels in the sorted `_unique_labels`).
         Given:
         * partition 0 has only labels: 0,1 (not necessarily just two samples it can have
           many samples but either from 0 or 1)
         *  partition 1 has only labels: 1, 2 (same count note as above)
         * and there are only two partitions then the following will be computed:
-        {
-          0: 1,
-          1: 2,
-          2: 1
-        }
+        [1, 2, 1]
         """
-        for unique_label in self._unique_labels:
-            self._unique_label_to_times_used_counter[unique_label] = 0
-        for unique_labels in self._partition_id_to_unique_labels.values():
-            for unique_label in unique_labels:
-                self._unique_label_to_times_used_counter[unique_label] += 1
+        self._unique_label_to_times_used_counter = np.bincount(
+            partition_label_ids.ravel(), minlength=len(self._unique_labels)
+        )
 
     def _check_correctness_of_unique_label_to_times_used_counter(
-        self, labels: NDArray
+        self, label_counts: NDArrayInt
     ) -> None:
         """Check if partitioning is possible given the presence requirements.
 
         The number of times the label can be used must be smaller or equal to the number
-        of times that the label is present in the dataset.
+        of times that the label is present in the dataset. The `label_counts` are
+        indexed by the position of the label in the sorted `_unique_labels`.
         """
-        for unique_label in self._unique_labels:
-            num_unique = np.sum(labels == unique_label)
-            if self._unique_label_to_times_used_counter[unique_label] > num_unique:
+        for label_id, unique_label in enumerate(self._unique_labels):
+            num_unique = label_counts[label_id]
+            if self._unique_label_to_times_used_counter[label_id] > num_unique:
                 raise ValueError(
                     f"Label: {unique_label} is needed to be assigned to more "
                     f"partitions "
-                    f"({self._unique_label_to_times_used_counter[unique_label]})"
+                    f"({self._unique_label_to_times_used_counter[label_id]})"
                     f" than there are samples (corresponding to this label) in the "
                     f"dataset ({num_unique}). Please decrease the `num_partitions`, "
                     f"`num_classes_per_partition` to avoid this situation, "
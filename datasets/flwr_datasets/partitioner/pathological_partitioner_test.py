@@ -111,6 +111,23 @@ class TestClassConstrainedPartitioner(unittest.TestCase):
             actual_classes.update(np.unique(partition["labels"]))
         self.assertEqual(expected_classes, actual_classes)
 
+    def test_first_class_deterministic_assignment_with_string_labels(self) -> None:
+        """Test deterministic assignment of first classes for non-integer labels."""
+        string_labels = [f"class_{i}" for i in range(10)]
+        dataset = Dataset.from_dict({"labels": string_labels * 10})
+        partitioner = PathologicalPartitioner(
+            num_partitions=10,
+            partition_by="labels",
+            num_classes_per_partition=2,
+            class_assignment_mode="first-deterministic",
+        )
+        partitioner.dataset = dataset
+        actual_classes = set()
+        for pid in range(10):
+            partition = partitioner.load_partition(pid)
+            actual_classes.update(np.unique(partition["labels"]))
+        self.assertEqual(set(string_labels), actual_classes)
+
     @parameterized.expand(
         [  # type: ignore
             # num_partitions, num_classes_per_partition, num_samples, num_unique_classes
@@ -16,6 +16,7 @@
 
 import re
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from string import Template
 from typing import Dict, Optional
@@ -57,6 +58,7 @@ class TemplateNotFound(Exception):
     """Raised when template does not exist."""
 
 
+@lru_cache(maxsize=None)
 def load_template(name: str) -> str:
     """Load template from template directory and return as text."""
     tpl_dir = (Path(__file__).parent / "templates").absolute()
@@ -69,13 +71,17 @@ def load_template(name: str) -> str:
         return tpl_file.read()
 
 
+@lru_cache(maxsize=None)
+def _compile_template(name: str) -> Template:
+    """Load template and return it as (cached) `Template` object."""
+    return Template(load_template(name))
+
+
 def render_template(template: str, data: Dict[str, str]) -> str:
     """Render template."""
-    tpl_file = load_template(template)
-    tpl = Template(tpl_file)
-    if ".gitignore" not in template:
-        return tpl.substitute(data)
-    return tpl.template
+    if ".gitignore" in template:
+        return load_template(template)
+    return _compile_template(template).substitute(data)
 
 
 def create_file(file_path: Path, content: str) -> None: